@@ -141,7 +141,7 @@ def release_full_environment(etos: ETOS, jsontas: JsonTas, suite_id: str) -> tup
             failure = release_environment(etos, jsontas, registry, sub_suite)
         except json.JSONDecodeError as exception:
             failure = exception
-        ETCDPath(key).delete()
+        ETCDPath(key, registry.testrun.database).delete()
     registry.testrun.delete_all()
 
     if failure:
@@ -15,14 +15,18 @@
 # limitations under the License.
 """ETOS Environment Provider module."""
 import sys
+import contextvars
+import functools
 import json
 import logging
 import os
 import time
 import traceback
 import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
 from datetime import datetime
-from tempfile import NamedTemporaryFile
 from typing import Any, Optional
 
 from etos_lib.etos import ETOS
@@ -34,29 +38,40 @@ from etos_lib.kubernetes.schemas.common import OwnerReference
 from etos_lib.kubernetes.schemas import Environment as EnvironmentSchema, EnvironmentSpec, Metadata
 from etos_lib.kubernetes.schemas import Test
 from etos_lib.kubernetes.schemas import Provider as ProviderSchema
+from etos_lib.kubernetes.schemas import ProviderSpec
 from etos_lib.kubernetes.schemas import EnvironmentRequest as EnvironmentRequestSchema
+from jsontas.dataset import Dataset
 from jsontas.jsontas import JsonTas
 from packageurl import PackageURL
 from opentelemetry import trace
 from opentelemetry.trace import SpanKind
 
+from execution_space_provider import ExecutionSpaceProvider
 from execution_space_provider.execution_space import ExecutionSpace
+from log_area_provider import LogAreaProvider
 from log_area_provider.log_area import LogArea
 
 from .lib.config import Config
 from .lib.encrypt import Encrypt
-from .lib.graphql import request_main_suite
+from .lib.graphql import request_main_suites
 from .lib.join import Join
 from .lib.json_dumps import JsonDumps
 from .lib.log_area import LogArea
 from .lib.registry import ProviderRegistry
-from .lib.database import ETCDPath
 from .lib.test_suite import TestSuite
 from .lib.uuid_generate import UuidGenerate
 from .splitter.split import Splitter
 
 logging.getLogger("pika").setLevel(logging.WARNING)
 
+EVENT_DATA_TIMEOUT = int(os.getenv("ETOS_EVENT_DATA_TIMEOUT", "10"))
+WAIT_FOR_IUT_TIMEOUT = int(os.getenv("ETOS_WAIT_FOR_IUT_TIMEOUT", "10"))
+WAIT_FOR_EXECUTION_SPACE_TIMEOUT = int(os.getenv("ETOS_WAIT_FOR_EXECUTION_SPACE_TIMEOUT", "10"))
+WAIT_FOR_LOG_AREA_TIMEOUT = int(os.getenv("ETOS_WAIT_FOR_LOG_AREA_TIMEOUT", "10"))
+MAX_PARALLEL_CHECKOUT = max(1, int(os.getenv("ETOS_MAX_PARALLEL_CHECKOUT", "16")))
+SUITE_ID_LABEL = "etos.eiffel-community.github.io/suite-id"
+SUB_SUITE_ID_LABEL = "etos.eiffel-community.github.io/sub-suite-id"
+
 
 class NoEventDataFound(Exception):
     """Could not fetch events from event storage."""
@@ -97,6 +112,9 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
         self.tracer = trace.get_tracer(__name__)
 
         self.suite_runner_ids = suite_runner_ids
+        self.main_suites = {}
+        self.owner_references: dict[str, list[OwnerReference]] = {}
+        self.environment_client: Optional[Environment] = None
 
         self.reset()
 
@@ -104,10 +122,14 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
         """Create a new dataset and provider registry."""
         self.jsontas = JsonTas()
         self.dataset = self.jsontas.dataset
-        self.dataset.add("json_dumps", JsonDumps)
-        self.dataset.add("uuid_generate", UuidGenerate)
-        self.dataset.add("join", Join)
-        self.dataset.add("encrypt", Encrypt)
+        self.dataset.merge(
+            {
+                "json_dumps": JsonDumps,
+                "uuid_generate": UuidGenerate,
+                "join": Join,
+                "encrypt": Encrypt,
+            }
+        )
         self.registry = ProviderRegistry(self.etos, self.jsontas, self.suite_id)
 
     def new_dataset(self, request: EnvironmentRequestSchema) -> None:
@@ -116,13 +138,16 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
         :param dataset: Dataset to use for this configuration.
         """
         self.reset()
-        self.dataset.add("identity", PackageURL.from_string(request.spec.identity))
-
-        self.dataset.add("artifact_id", request.spec.artifact)
-        self.dataset.add("context", self.environment_provider_config.context)
-
         dataset = request.spec.dataset or {}
-        self.dataset.add("dataset", dataset)
+        self.dataset.merge(
+            {
+                "identity": PackageURL.from_string(request.spec.identity),
+                "artifact_id": request.spec.artifact,
+                "context": self.environment_provider_config.context,
+                "dataset": dataset,
+            }
+        )
+        # The user supplied dataset is merged last so that it can override the keys above.
         self.dataset.merge(dataset)
 
         self.iut_provider = self.registry.iut_provider()
@@ -142,34 +167,52 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
         self.logger.info("Registry is configured.")
         self.etos.config.set("SUITE_ID", request.spec.identifier)
 
-        self.etos.config.set("EVENT_DATA_TIMEOUT", int(os.getenv("ETOS_EVENT_DATA_TIMEOUT", "10")))
-        self.etos.config.set(
-            "WAIT_FOR_IUT_TIMEOUT", int(os.getenv("ETOS_WAIT_FOR_IUT_TIMEOUT", "10"))
-        )
-        self.etos.config.set(
-            "WAIT_FOR_EXECUTION_SPACE_TIMEOUT",
-            int(os.getenv("ETOS_WAIT_FOR_EXECUTION_SPACE_TIMEOUT", "10")),
-        )
-        self.etos.config.set(
-            "WAIT_FOR_LOG_AREA_TIMEOUT",
-            int(os.getenv("ETOS_WAIT_FOR_LOG_AREA_TIMEOUT", "10")),
-        )
+        self.etos.config.set("EVENT_DATA_TIMEOUT", EVENT_DATA_TIMEOUT)
+        self.etos.config.set("WAIT_FOR_IUT_TIMEOUT", WAIT_FOR_IUT_TIMEOUT)
+        self.etos.config.set("WAIT_FOR_EXECUTION_SPACE_TIMEOUT", WAIT_FOR_EXECUTION_SPACE_TIMEOUT)
+        self.etos.config.set("WAIT_FOR_LOG_AREA_TIMEOUT", WAIT_FOR_LOG_AREA_TIMEOUT)
+
+        # The publisher is shared by all requests and stopped when the environment provider
+        # has finished running.
+        if self.etos.publisher is None:
+            self.logger.info("Connect to RabbitMQ")
+            self.etos.config.rabbitmq_publisher_from_environment()
+            self.etos.start_publisher()
+            if not self.etos.debug.disable_sending_events:
+                self.etos.publisher.wait_start()
+            self.logger.info("Connected")
+
+    @staticmethod
+    def _is_external(provider: Any) -> bool:
+        """Whether or not a provider is an external provider.
+
+        External providers do not evaluate rulesets against the dataset, but they do store
+        their checkouts in it, see :meth:`_checkout_concurrently`.
+
+        :param provider: Provider to check.
+        :return: True if the provider is external.
+        """
+        return provider.ruleset.get("type", "jsontas") == "external"
+
+    @staticmethod
+    def _checkin_all(provider: Any) -> None:
+        """Check in everything checked out from a provider, ignoring any failures.
 
-        self.logger.info("Connect to RabbitMQ")
-        self.etos.config.rabbitmq_publisher_from_environment()
-        self.etos.start_publisher()
-        if not self.etos.debug.disable_sending_events:
-            self.etos.publisher.wait_start()
-        self.logger.info("Connected")
+        :param provider: Provider to check in all items for.
+        """
+        with suppress(Exception):
+            provider.checkin_all()
 
     def cleanup(self) -> None:
         """Clean up by checkin in all checked out providers."""
         self.logger.info("Cleanup by checking in all checked out providers.")
-        for provider in self.etos.config.get("PROVIDERS"):
-            try:
-                provider.checkin_all()
-            except:  # noqa pylint:disable=bare-except
-                pass
+        providers = self.etos.config.get("PROVIDERS") or []
+        external = [provider for provider in providers if self._is_external(provider)]
+        with ThreadPoolExecutor(max_workers=min(8, len(external)) or 1) as pool:
+            pool.map(self._checkin_all, external)
+            for provider in providers:
+                if provider not in external:
+                    self._checkin_all(provider)
 
     @staticmethod
     def get_constraint(recipe: dict, key: str) -> Any:
@@ -189,11 +232,23 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
 
         :param test_runners: Dictionary with test_runners as keys.
         """
-        total_test_count = 0
-        for _, data in test_runners.items():
-            total_test_count += len(data["unsplit_recipes"])
+        total_test_count = sum(len(data["unsplit_recipes"]) for data in test_runners.values())
         self.etos.config.set("TOTAL_TEST_COUNT", total_test_count)
-        self.etos.config.set("NUMBER_OF_TESTRUNNERS", len(test_runners.keys()))
+        self.etos.config.set("NUMBER_OF_TESTRUNNERS", len(test_runners))
+
+    def _store_sub_suites(self, sub_suites: list[dict]) -> None:
+        """Store the created sub suites in the ETOS database.
+
+        :param sub_suites: Sub suites to store.
+        """
+        values = {}
+        for sub_suite in sub_suites:
+            # In a valid sub suite all of these keys must exist
+            # making this a safe assumption
+            event_id = sub_suite["executor"]["instructions"]["environment"]["ENVIRONMENT_ID"]
+            path = f"suite/{sub_suite['test_suite_started_id']}/subsuite/{event_id}/suite"
+            values[path] = json.dumps(sub_suite)
+        self.registry.testrun.write_many(values)
 
     def send_environment_events(self, url: str, sub_suite: dict) -> None:
         """Send environment defined events for the created sub suites.
@@ -212,9 +267,6 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
             {"name": sub_suite.get("name"), "uri": url},
         )
 
-        suite = self.registry.testrun.join(f"suite/{sub_suite['test_suite_started_id']}")
-        suite.join(f"/subsuite/{event_id}/suite").write(json.dumps(sub_suite))
-
     def upload_sub_suite(self, sub_suite: dict) -> tuple[str, dict]:
         """Upload sub suite to log area.
 
@@ -223,21 +275,16 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
         """
         sub_suite = sub_suite.copy()
         sub_suite["recipes"] = self.recipes_from_tests(sub_suite["recipes"])
-        try:
-            with NamedTemporaryFile(mode="w", delete=False) as sub_suite_file:
-                json.dump(sub_suite, sub_suite_file)
-            log_area = LogArea(self.etos, sub_suite)
-            return (
-                log_area.upload(
-                    sub_suite_file.name,
-                    f"{sub_suite['name']}.json",
-                    sub_suite["test_suite_started_id"],
-                    sub_suite["sub_suite_id"],
-                ),
-                sub_suite,
-            )
-        finally:
-            os.remove(sub_suite_file.name)
+        log_area = LogArea(self.etos, sub_suite)
+        return (
+            log_area.upload_bytes(
+                json.dumps(sub_suite).encode(),
+                f"{sub_suite['name']}.json",
+                sub_suite["test_suite_started_id"],
+                sub_suite["sub_suite_id"],
+            ),
+            sub_suite,
+        )
 
     def recipes_from_tests(self, tests: list[Test]) -> list[dict]:
         """Load Eiffel TERCC recipes from test.
@@ -245,41 +292,63 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
         :param tests: The tests defined in a Test model.
         :return: A list of Eiffel TERCC recipes.
         """
-        recipes: list[dict] = []
-        for test in tests:
-            recipes.append(
-                {
-                    "id": test.id,
-                    "testCase": test.testCase.model_dump(),
-                    "constraints": [
-                        {
-                            "key": "ENVIRONMENT",
-                            "value": test.execution.environment,
-                        },
-                        {
-                            "key": "COMMAND",
-                            "value": test.execution.command,
-                        },
-                        {
-                            "key": "EXECUTE",
-                            "value": test.execution.execute,
-                        },
-                        {
-                            "key": "CHECKOUT",
-                            "value": test.execution.checkout,
-                        },
-                        {
-                            "key": "PARAMETERS",
-                            "value": test.execution.parameters,
-                        },
-                        {
-                            "key": "TEST_RUNNER",
-                            "value": test.execution.testRunner,
-                        },
-                    ],
-                }
-            )
-        return recipes
+        return [
+            {
+                "id": test.id,
+                "testCase": test.testCase.model_dump(),
+                "constraints": [
+                    {
+                        "key": "ENVIRONMENT",
+                        "value": test.execution.environment,
+                    },
+                    {
+                        "key": "COMMAND",
+                        "value": test.execution.command,
+                    },
+                    {
+                        "key": "EXECUTE",
+                        "value": test.execution.execute,
+                    },
+                    {
+                        "key": "CHECKOUT",
+                        "value": test.execution.checkout,
+                    },
+                    {
+                        "key": "PARAMETERS",
+                        "value": test.execution.parameters,
+                    },
+                    {
+                        "key": "TEST_RUNNER",
+                        "value": test.execution.testRunner,
+                    },
+                ],
+            }
+            for test in tests
+        ]
+
+    def _environment_owner_references(
+        self, request: EnvironmentRequestSchema
+    ) -> list[OwnerReference]:
+        """Get the owner references for the Environment resources of a request.
+
+        The references are created once per request, instead of for every sub suite.
+
+        :param request: The environment request that owns the Environment resources.
+        :return: Owner references for an Environment resource.
+        """
+        if request.metadata.uid not in self.owner_references:
+            self.owner_references[request.metadata.uid] = [
+                *request.metadata.ownerReferences,
+                OwnerReference.model_construct(
+                    kind="EnvironmentRequest",
+                    name=request.metadata.name,
+                    uid=request.metadata.uid,
+                    apiVersion="etos.eiffel-community.github.io/v1alpha1",
+                    controller=False,
+                    blockOwnerDeletion=True,
+                ),
+            ]
+        return list(self.owner_references[request.metadata.uid])
 
     def create_environment_resource(
         self, request: EnvironmentRequestSchema, sub_suite: dict
@@ -292,37 +361,48 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
         # In a valid sub suite all of these keys must exist
         # making this a safe assumption
         environment_id = sub_suite["executor"]["instructions"]["environment"]["ENVIRONMENT_ID"]
-        labels = request.metadata.labels or {}
-        labels["etos.eiffel-community.github.io/suite-id"] = sub_suite["test_suite_started_id"]
-        labels["etos.eiffel-community.github.io/sub-suite-id"] = sub_suite["sub_suite_id"]
-        owners = request.metadata.ownerReferences
-        owners.append(
-            OwnerReference(
-                kind="EnvironmentRequest",
-                name=request.metadata.name,
-                uid=request.metadata.uid,
-                apiVersion="etos.eiffel-community.github.io/v1alpha1",
-                controller=False,
-                blockOwnerDeletion=True,
-            )
-        )
-        environment = EnvironmentSchema(
-            metadata=Metadata(
+        labels = {
+            **(request.metadata.labels or {}),
+            SUITE_ID_LABEL: sub_suite["test_suite_started_id"],
+            SUB_SUITE_ID_LABEL: sub_suite["sub_suite_id"],
+        }
+        # The Environment is created by us from already validated data.
+        environment = EnvironmentSchema.model_construct(
+            metadata=Metadata.model_construct(
                 name=environment_id,
                 namespace=request.metadata.namespace,
                 labels=labels,
-                ownerReferences=owners,
+                ownerReferences=self._environment_owner_references(request),
             ),
-            spec=EnvironmentSpec(**sub_suite.copy()),
+            spec=EnvironmentSpec.model_construct(**sub_suite),
         )
-        environment_client = Environment(self.kubernetes)
-        if not environment_client.create(environment):
+        if self.environment_client is None:
+            self.environment_client = Environment(self.kubernetes)
+        if not self.environment_client.create(environment):
             raise RuntimeError("Failed to create the environment for an etos testrun")
         return (
             f"{os.getenv('ETOS_API')}/v1alpha/testrun/{environment_id}",
             environment.spec.model_dump(),
         )
 
+    def _create_environment_resources(
+        self, request: EnvironmentRequestSchema, sub_suites: list[dict]
+    ) -> list[tuple[str, dict]]:
+        """Create environment resources in Kubernetes for several sub suites concurrently.
+
+        :param request: The environment request that the sub suites were created for.
+        :param sub_suites: Sub suites to create Environment resources for.
+        :return: URIs to ETOS API for ETR to fetch resources, together with the sub suites.
+        """
+        # Created here, so that the threads do not race to create them.
+        if self.environment_client is None:
+            self.environment_client = Environment(self.kubernetes)
+        self._environment_owner_references(request)
+        with ThreadPoolExecutor(max_workers=min(8, len(sub_suites))) as pool:
+            return list(
+                pool.map(functools.partial(self.create_environment_resource, request), sub_suites)
+            )
+
     def checkout_an_execution_space(self) -> ExecutionSpace:
         """Check out a single execution space.
 
@@ -337,12 +417,124 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
         """
         return self.log_area_provider.wait_for_and_checkout_log_areas(1, 1)[0]
 
+    def _can_checkout_concurrently(self) -> bool:
+        """Whether execution spaces and log areas can be checked out concurrently.
+
+        JSONTas providers evaluate their rulesets against the shared dataset, which is updated
+        for every IUT, so those must be checked out one IUT at a time.
+        """
+        return all(
+            self._is_external(provider)
+            for provider in (self.execution_space_provider, self.log_area_provider)
+        )
+
+    def _checkout_an_execution_space_and_log_area(
+        self,
+        test_runner: str,
+        execution_space_provider: Any,
+        log_area_provider: Any,
+        dataset: Dataset,
+    ) -> tuple[ExecutionSpace, LogArea]:
+        """Check out a single execution space and a single log area.
+
+        :param test_runner: The test runner that the execution space and log area is for.
+        :param execution_space_provider: Provider to check out the execution space from.
+        :param log_area_provider: Provider to check out the log area from.
+        :param dataset: Dataset that the providers were created with.
+        :return: An execution space and a log area.
+        """
+        with self.tracer.start_as_current_span(
+            "request_execution_space", kind=SpanKind.CLIENT
+        ) as span:
+            span.set_attribute(SemConvAttributes.TEST_RUNNER_ID, test_runner)
+            executor = execution_space_provider.wait_for_and_checkout_execution_spaces(1, 1)[0]
+            dataset.add("executor", executor)
+
+        with self.tracer.start_as_current_span("request_log_area", kind=SpanKind.CLIENT) as span:
+            span.set_attribute(SemConvAttributes.TEST_RUNNER_ID, test_runner)
+            log_area = log_area_provider.wait_for_and_checkout_log_areas(1, 1)[0]
+        return executor, log_area
+
+    def _checkout_sequentially(self, test_runner: str, iuts: dict) -> None:
+        """Check out an execution space and a log area for each IUT, one IUT at a time.
+
+        :param test_runner: The test runner that the IUTs are assigned to.
+        :param iuts: IUTs, and their suites, to check out execution spaces and log areas for.
+        """
+        for iut, suite in iuts.items():
+            self.dataset.merge({"iut": iut, "suite": suite})
+            suite["sub_suite_id"] = str(uuid.uuid4())
+            suite["executor"], suite["log_area"] = self._checkout_an_execution_space_and_log_area(
+                test_runner, self.execution_space_provider, self.log_area_provider, self.dataset
+            )
+
+    def _checkout_concurrently(self, test_runner: str, iuts: dict) -> None:
+        """Check out an execution space and a log area for all IUTs concurrently.
+
+        External providers store what they check out in the dataset that they were created
+        with, and check in everything stored there if a checkout fails. Every IUT therefore
+        gets a copy of the dataset and providers of its own, and the shared dataset is only
+        updated from this thread, after all checkouts have finished.
+
+        :param test_runner: The test runner that the IUTs are assigned to.
+        :param iuts: IUTs, and their suites, to check out execution spaces and log areas for.
+        """
+        checkouts = {}
+        for iut, suite in iuts.items():
+            jsontas = JsonTas(dataset=self.dataset.copy())
+            jsontas.dataset.merge({"iut": iut, "suite": suite})
+            checkouts[iut] = (
+                ExecutionSpaceProvider(self.etos, jsontas, self.execution_space_provider.ruleset),
+                LogAreaProvider(self.etos, jsontas, self.log_area_provider.ruleset),
+                jsontas.dataset,
+            )
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_CHECKOUT, len(iuts))) as pool:
+            futures = {
+                iut: pool.submit(
+                    contextvars.copy_context().run,
+                    self._checkout_an_execution_space_and_log_area,
+                    test_runner,
+                    *checkout,
+                )
+                for iut, checkout in checkouts.items()
+            }
+        errors = [future.exception() for future in futures.values() if future.exception()]
+        if errors:
+            # A failed provider only checks in what it checked out itself, so the execution
+            # space of an IUT whose log area checkout failed would otherwise be leaked.
+            for execution_space_provider, log_area_provider, _ in checkouts.values():
+                self._checkin_all(execution_space_provider)
+                self._checkin_all(log_area_provider)
+            raise errors[0]
+        for iut, suite in iuts.items():
+            suite["sub_suite_id"] = str(uuid.uuid4())
+            suite["executor"], suite["log_area"] = futures[iut].result()
+            self.dataset.merge(
+                {
+                    "iut": iut,
+                    "suite": suite,
+                    "executor": suite["executor"],
+                    # Same as the providers store when checking out sequentially.
+                    "execution_spaces": [suite["executor"]],
+                    "logs": [suite["log_area"]],
+                }
+            )
+
+    def _maximum_amount_of_iuts(self) -> Any:
+        """Get the maximum amount of IUTs to check out.
+
+        :return: Maximum amount from the dataset, ETOS_MAX_PARALLEL_IUTS or the total test count.
+        """
+        return self.dataset.get(
+            "maximum_amount",
+            os.getenv("ETOS_MAX_PARALLEL_IUTS", self.etos.config.get("TOTAL_TEST_COUNT")),
+        )
+
     def checkout_timeout(self) -> int:
         """Get timeout for checkout."""
-        iut_timeout = self.etos.config.get("WAIT_FOR_IUT_TIMEOUT")
-        exec_timeout = self.etos.config.get("WAIT_FOR_EXECUTION_SPACE_TIMEOUT")
-        log_timeout = self.etos.config.get("WAIT_FOR_LOG_AREA_TIMEOUT")
-        timeout = iut_timeout + exec_timeout + log_timeout + 10
+        timeout = (
+            WAIT_FOR_IUT_TIMEOUT + WAIT_FOR_EXECUTION_SPACE_TIMEOUT + WAIT_FOR_LOG_AREA_TIMEOUT + 10
+        )
         minutes, seconds = divmod(timeout, 60)
         hours, minutes = divmod(minutes, 60)
 
@@ -358,26 +550,82 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
         )
         return endtime
 
+    @staticmethod
+    def _test_runners(request: EnvironmentRequestSchema) -> dict:
+        """Group the tests of a request by the test runner that shall execute them.
+
+        :param request: Environment request to get the tests from.
+        :return: Test runners and their unsplit recipes.
+        """
+        # TODO: This is a hack to make the controller environment work without too many changes
+        # to the original code, since we want to run them at the same time.
+        tests = defaultdict(list)
+        for test in request.spec.splitter.tests:
+            tests[test.execution.testRunner].append(test)
+        return {
+            test_runner: {"docker": test_runner, "priority": 1, "unsplit_recipes": unsplit_recipes}
+            for test_runner, unsplit_recipes in tests.items()
+        }
+
+    def _checkout_iuts(
+        self,
+        request: EnvironmentRequestSchema,
+        splitter: Splitter,
+        test_runners: dict,
+        maximum_amount: Any,
+    ) -> None:
+        """Check out IUTs and assign them to test runners.
+
+        :param request: Environment request to check out IUTs for.
+        :param splitter: Splitter to assign the IUTs to test runners with.
+        :param test_runners: Test runners to assign IUTs to.
+        :param maximum_amount: Maximum amount of IUTs to check out.
+        """
+        with self.tracer.start_as_current_span("request_iuts", kind=SpanKind.CLIENT) as span:
+            iuts = self.iut_provider.wait_for_and_checkout_iuts(
+                minimum_amount=request.spec.minimumAmount,
+                # maximum_amount=request.spec.maximumAmount,
+                # TODO: Total test count changes, must check
+                maximum_amount=maximum_amount,
+            )
+            splitter.assign_iuts(test_runners, iuts)
+            span.set_attribute(SemConvAttributes.IUT_DESCRIPTION, str(iuts))
+
+    def _create_environments(
+        self, request: EnvironmentRequestSchema, sub_suites: list[dict], etos_controller: bool
+    ) -> None:
+        """Create environments for sub suites, store them and send environment events.
+
+        :param request: Environment request that the sub suites were created for.
+        :param sub_suites: Sub suites to create environments for.
+        :param etos_controller: Whether to create Environment resources instead of uploading
+                                the sub suites to a log area.
+        """
+        if etos_controller:
+            environments = self._create_environment_resources(request, sub_suites)
+        else:
+            environments = [self.upload_sub_suite(sub_suite) for sub_suite in sub_suites]
+
+        # Store all sub suites in one go and send environment events to the ESR.
+        self._store_sub_suites([sub_suite for _, sub_suite in environments])
+        for url, sub_suite in environments:
+            self.send_environment_events(url, sub_suite)
+            self.logger.info(
+                "Environment for %r checked out and is ready for use",
+                sub_suite["name"],
+                extra={"user_log": True},
+            )
+
     def checkout(self, request: EnvironmentRequestSchema) -> None:
         """Checkout an environment for a test suite.
 
         A request can have multiple environments due to IUT availability or the amount of
         unique test runners in the request.
         """
-        # pylint:disable=too-many-statements
         self.logger.info("Checkout environment for %r", request.spec.name, extra={"user_log": True})
         self.new_dataset(request)
         splitter = Splitter(self.etos, request.spec.splitter)
-
-        # TODO: This is a hack to make the controller environment work without too many changes
-        # to the original code, since we want to run them at the same time.
-        test_runners = {}
-        for test in request.spec.splitter.tests:
-            test_runners.setdefault(
-                test.execution.testRunner,
-                {"docker": test.execution.testRunner, "priority": 1, "unsplit_recipes": []},
-            )
-            test_runners[test.execution.testRunner]["unsplit_recipes"].append(test)
+        test_runners = self._test_runners(request)
 
         self.set_total_test_count_and_test_runners(test_runners)
 
@@ -412,27 +660,21 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
             request.spec.id,
             self.environment_provider_config,
         )
+        # None of these change during the checkout, except for the total test count which is
+        # updated when test runners finish.
+        etos_controller = self.environment_provider_config.etos_controller
+        concurrent_checkout = self._can_checkout_concurrently()
+        maximum_amount = self._maximum_amount_of_iuts()
         finished = []
+        # Start polling quickly and back off exponentially while nothing is finished so that
+        # we don't wait idle when providers become available shortly after a failed attempt.
+        delay = 0.1
         timeout = self.checkout_timeout()
         while time.time() < timeout:
-            self.set_total_test_count_and_test_runners(test_runners)
-
-            with self.tracer.start_as_current_span("request_iuts", kind=SpanKind.CLIENT) as span:
-                # Check out and assign IUTs to test runners.
-                iuts = self.iut_provider.wait_for_and_checkout_iuts(
-                    minimum_amount=request.spec.minimumAmount,
-                    # maximum_amount=request.spec.maximumAmount,
-                    # TODO: Total test count changes, must check
-                    maximum_amount=self.dataset.get(
-                        "maximum_amount",
-                        os.getenv(
-                            "ETOS_MAX_PARALLEL_IUTS",
-                            self.etos.config.get("TOTAL_TEST_COUNT"),
-                        ),
-                    ),
-                )
-                splitter.assign_iuts(test_runners, iuts)
-                span.set_attribute(SemConvAttributes.IUT_DESCRIPTION, str(iuts))
+            number_of_finished = len(finished)
+
+            # Check out and assign IUTs to test runners.
+            self._checkout_iuts(request, splitter, test_runners, maximum_amount)
 
             for test_runner in test_runners:  # pylint:disable=consider-using-dict-items
                 self.dataset.add("test_runner", test_runner)
@@ -442,44 +684,22 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
                     continue
 
                 # Check out an executor and log area for each IUT.
-                for iut, suite in test_runners[test_runner].get("iuts", {}).items():
-                    self.dataset.add("iut", iut)
-                    self.dataset.add("suite", suite)
-                    suite["sub_suite_id"] = str(uuid.uuid4())
-
-                    with self.tracer.start_as_current_span(
-                        "request_execution_space", kind=SpanKind.CLIENT
-                    ) as span:
-                        span.set_attribute(SemConvAttributes.TEST_RUNNER_ID, test_runner)
-                        suite["executor"] = self.checkout_an_execution_space()
-                        self.dataset.add("executor", suite["executor"])
-
-                    with self.tracer.start_as_current_span(
-                        "request_log_area", kind=SpanKind.CLIENT
-                    ) as span:
-                        span.set_attribute(SemConvAttributes.TEST_RUNNER_ID, test_runner)
-                        suite["log_area"] = self.checkout_a_log_area()
+                if concurrent_checkout:
+                    self._checkout_concurrently(test_runner, test_runners[test_runner]["iuts"])
+                else:
+                    self._checkout_sequentially(test_runner, test_runners[test_runner]["iuts"])
 
                 # Split the tests into sub suites
                 splitter.split(test_runners[test_runner])
 
-                # Add sub suites to test suite structure and send environment events to the ESR.
-                for iut, suite in test_runners[test_runner].get("iuts", {}).items():
-                    sub_suite = test_suite.add(
+                # Add sub suites to test suite structure.
+                sub_suites = [
+                    test_suite.add(
                         request, test_runner, iut, suite, test_runners[test_runner]["priority"]
                     )
-                    if self.environment_provider_config.etos_controller:
-                        self.send_environment_events(
-                            *self.create_environment_resource(request, sub_suite)
-                        )
-                    else:
-                        self.send_environment_events(*self.upload_sub_suite(sub_suite))
-
-                    self.logger.info(
-                        "Environment for %r checked out and is ready for use",
-                        sub_suite["name"],
-                        extra={"user_log": True},
-                    )
+                    for iut, suite in test_runners[test_runner].get("iuts", {}).items()
+                ]
+                self._create_environments(request, sub_suites, etos_controller)
                 finished.append(test_runner)
 
             # Remove finished sub suites.
@@ -492,7 +712,14 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
             # Exit only if there are no sub suites left to assign
             if not test_runners:
                 break
-            time.sleep(5)
+            if len(finished) > number_of_finished:
+                # The test count only changes when test runners are removed.
+                self.set_total_test_count_and_test_runners(test_runners)
+                maximum_amount = self._maximum_amount_of_iuts()
+                delay = 0.1
+            else:
+                delay = min(delay * 2, 5.0)
+            time.sleep(delay)
         else:
             raise TimeoutError("Could not check out an environment before timeout.")
 
@@ -502,18 +729,31 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
             extra={"user_log": True},
         )
 
-    def wait_for_main_suite(self, test_suite_id: str) -> dict:
+    def wait_for_main_suite(self, test_suite_id: str) -> Optional[dict]:
         """Wait for main test suite started to be available in ER.
 
+        The main suites of all requests are queried together and cached, so that the
+        requests that follow do not need to query ER again if their main suites were
+        already found.
+
         :param test_suite_id: The ID of the test suite started.
         :return: a test suite started event.
         """
-        main_suite = request_main_suite(self.etos, test_suite_id)
+        if test_suite_id in self.main_suites:
+            return self.main_suites[test_suite_id]
+        ids = {test_suite_id}
+        ids.update(request.spec.id for request in self.environment_provider_config.requests)
         timeout = time.time() + 30
-        while main_suite is None and time.time() < timeout:
-            main_suite = request_main_suite(self.etos, test_suite_id)
-            time.sleep(5)
-        return main_suite
+        delay = 0.1
+        while True:
+            missing = sorted(ids.difference(self.main_suites))
+            self.main_suites.update(request_main_suites(self.etos, missing))
+            remaining = timeout - time.time()
+            if test_suite_id in self.main_suites or remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 5.0)
+        return self.main_suites.get(test_suite_id)
 
     def _run(self, request: EnvironmentRequestSchema) -> None:
         """Run the environment provider task."""
@@ -560,30 +800,17 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
             if triggered is not None:
                 self.etos.events.send_activity_finished(triggered, outcome)
 
-    def _configure_provider(self, provider_db: ETCDPath, provider_spec: dict, name: str):
-        """Configure a single provider for a testrun."""
-        self.logger.info("Saving provider with name %r in %r", name, provider_db)
-        provider_model = ProviderSchema.model_validate(provider_spec)
+    def _provider_ruleset(self, provider_spec: dict, name: str) -> str:
+        """Create the ruleset to store in the database for a single provider."""
+        # The provider was read from the Kubernetes API, which has already validated it
+        # against the CRD. The spec is still validated in order to build its nested models.
+        provider_model = ProviderSchema.model_construct(
+            spec=ProviderSpec.model_validate(provider_spec["spec"]),
+            metadata=Metadata.model_construct(**provider_spec["metadata"]),
+        )
         if provider_model.spec.jsontas:
-            ruleset = json.dumps({name: provider_model.to_jsontas()})
-        else:
-            ruleset = json.dumps({name: provider_model.to_external()})
-        provider_db.write(ruleset)
-
-    def _configure_iut(self, provider_spec: dict):
-        """Configure iut provider for a testrun."""
-        db = self.registry.testrun.join("provider/iut")  # type: ignore
-        self._configure_provider(db, provider_spec, "iut")
-
-    def _configure_log_area(self, provider_spec: dict):
-        """Configure log area provider for a testrun."""
-        db = self.registry.testrun.join("provider/log-area")  # type: ignore
-        self._configure_provider(db, provider_spec, "log")
-
-    def _configure_execution_space(self, provider_spec: dict):
-        """Configure execution space provider for a testrun."""
-        db = self.registry.testrun.join("provider/execution-space")  # type: ignore
-        self._configure_provider(db, provider_spec, "execution_space")
+            return json.dumps({name: provider_model.to_jsontas()})
+        return json.dumps({name: provider_model.to_external()})
 
     def _configure_dataset(self, datasets: list[dict]):
         """Configure dataset for a testrun."""
@@ -596,12 +823,19 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
         provider_client = Provider(self.kubernetes)
 
         iut = provider_client.get(request.spec.providers.iut.id).to_dict()  # type: ignore
-        self._configure_iut(iut)  # type: ignore
         log_area = provider_client.get(request.spec.providers.logArea.id).to_dict()  # type: ignore
-        self._configure_log_area(log_area)  # type: ignore
         provider_id = request.spec.providers.executionSpace.id  # type: ignore
         execution_space = provider_client.get(provider_id).to_dict()  # type: ignore
-        self._configure_execution_space(execution_space)  # type: ignore
+        # All providers are written in a single transaction.
+        rulesets = {
+            "provider/iut": self._provider_ruleset(iut, "iut"),  # type: ignore
+            "provider/log-area": self._provider_ruleset(log_area, "log"),  # type: ignore
+            "provider/execution-space": self._provider_ruleset(
+                execution_space, "execution_space"  # type: ignore
+            ),
+        }
+        self.logger.info("Saving providers %r in %r", list(rulesets), self.registry.testrun)
+        self.registry.testrun.write_many(rulesets)  # type: ignore
 
     def run(self) -> dict:
         """Run the environment provider task.
@@ -620,11 +854,12 @@ class EnvironmentProvider:  # pylint:disable=too-many-instance-attributes
             return {"error": None}
         except Exception as exception:  # pylint:disable=broad-except
             self.cleanup()
-            traceback.print_exc()
+            details = traceback.format_exc()
+            print(details, file=sys.stderr, end="")
             self.logger.error(
                 "Failed creating environment for test. %r", exception, extra={"user_log": True}
             )
-            return {"error": str(exception), "details": traceback.format_exc()}
+            return {"error": str(exception), "details": details}
         finally:
             if self.etos.publisher is not None and not self.etos.debug.disable_sending_events:
                 self.etos.publisher.wait_for_unpublished_events()
@@ -0,0 +1,37 @@
+# Copyright Axis Communications AB.
+#
+# For a full list of individual contributors, please see the commit history.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Exponential backoff module."""
+import time
+from typing import Iterator
+
+
+def backoff(end: float, delay: float = 0.1, maximum_delay: float = 5.0) -> Iterator[None]:
+    """Yield until an end time, sleeping with an exponential backoff between the iterations.
+
+    The first iteration is yielded immediately, so that there is no delay before a first attempt.
+
+    :param end: Time, as returned by time.time(), at which to stop yielding.
+    :param delay: Delay before the second iteration, which is doubled for every iteration.
+    :param maximum_delay: Maximum delay between two iterations.
+    """
+    first_iteration = True
+    while time.time() < end:
+        if first_iteration:
+            first_iteration = False
+        else:
+            time.sleep(delay)
+            delay = min(delay * 2, maximum_delay)
+        yield
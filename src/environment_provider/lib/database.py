@@ -14,28 +14,54 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """ETCD helpers."""
+import base64
+import inspect
 import os
 from threading import Event
-from typing import Any, Iterator, Optional, Union
+from typing import Any, Callable, Iterator, Optional, Union
 
 from etcd3gw import client
+from etcd3gw.client import Etcd3Client
 from etos_lib.lib.config import Config as ETOSConfig
 
+# Default value of the '--max-txn-ops' setting in ETCD.
+MAX_TRANSACTION_OPERATIONS = 128
+
+# etcd3gw encodes the range end of get requests itself from version 2.6, but sends it as
+# given in earlier versions.
+GET_ENCODES_RANGE_END = "range_end" in inspect.signature(Etcd3Client.get).parameters
+
+
+def _encode(data: Any) -> str:
+    """Base64 encode data the same way as the ETCD client does.
+
+    :param data: Data to encode.
+    :return: Base64 encoded string.
+    """
+    if not isinstance(data, bytes):
+        data = str(data).encode()
+    return base64.b64encode(data).decode()
+
 
 class ETCDPath:
     """An ETCD path is like a filesystem path, but it works with keys in ETCD."""
 
-    def __init__(self, path: Union[str, bytes] = "/") -> None:
-        """Initialize."""
-        if ETOSConfig().get("database") is None:
-            ETOSConfig().set(
-                "database",
-                client(
-                    host=os.getenv("ETOS_ETCD_HOST", "etcd-client"),
-                    port=int(os.getenv("ETOS_ETCD_PORT", "2379")),
-                ),
+    def __init__(self, path: Union[str, bytes] = "/", database: Optional[client] = None) -> None:
+        """Initialize.
+
+        :param path: The ETCD path.
+        :param database: ETCD client to use. If not set, the client stored in the ETOS config is
+                         used, and created if there is none.
+        """
+        if database is None:
+            database = ETOSConfig().get("database")
+        if database is None:
+            database = client(
+                host=os.getenv("ETOS_ETCD_HOST", "etcd-client"),
+                port=int(os.getenv("ETOS_ETCD_PORT", "2379")),
             )
-        self.database: client = ETOSConfig().get("database")
+            ETOSConfig().set("database", database)
+        self.database: client = database
         if isinstance(path, bytes):
             path = path.decode()
         self.path = path
@@ -47,7 +73,7 @@ class ETCDPath:
         """
         if new.startswith("/"):
             new = new[1:]
-        return ETCDPath("/".join((self.path, new)))
+        return ETCDPath("/".join((self.path, new)), self.database)
 
     def write(self, value: Any, expire: Optional[int] = None) -> None:
         """Write a value to an ETCD path.
@@ -60,6 +86,24 @@ class ETCDPath:
             lease = self.database.lease(expire)
         self.database.put(self.path, value, lease)
 
+    def write_many(self, values: dict[str, Any]) -> None:
+        """Write values to several paths "below" this path using transactions.
+
+        :param values: Values to write, keyed by paths relative to this path.
+        """
+        puts = [
+            {"request_put": {"key": _encode(self.join(path).path), "value": _encode(value)}}
+            for path, value in values.items()
+        ]
+        for index in range(0, len(puts), MAX_TRANSACTION_OPERATIONS):
+            self.database.transaction(
+                {
+                    "compare": [],
+                    "success": puts[index : index + MAX_TRANSACTION_OPERATIONS],
+                    "failure": [],
+                }
+            )
+
     def read(self) -> Optional[bytes]:
         """Read the values from an ETCD path."""
         try:
@@ -67,6 +111,13 @@ class ETCDPath:
         except IndexError:
             return None
 
+    def exists(self) -> bool:
+        """Check whether there are any keys "below" a path, without reading all of them."""
+        range_end = self.path[:-1] + chr(ord(self.path[-1]) + 1)
+        if not GET_ENCODES_RANGE_END:
+            range_end = _encode(range_end)
+        return bool(self.database.get(self.path, range_end=range_end, limit=1))
+
     def read_all(self) -> list[tuple[bytes, dict]]:
         """Read values of all keys "below" a path."""
         return self.database.get_prefix(self.path)
@@ -79,6 +130,11 @@ class ETCDPath:
         """Watch an ETCD path for any changes to itself or its children."""
         return self.database.watch(self.path, range_end="\0")
 
+    def watch_prefix(self) -> tuple[Iterator[dict], Callable[[], None]]:
+        """Watch for any changes to keys starting with this path."""
+        range_end = self.path[:-1] + chr(ord(self.path[-1]) + 1)
+        return self.database.watch(self.path, range_end=range_end)
+
     def delete(self) -> None:
         """Delete the ETCD path."""
         self.database.delete(self.path)
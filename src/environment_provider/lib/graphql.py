@@ -162,16 +162,16 @@ def request_artifact_published(etos: ETOS, artifact_id: str) -> Optional[dict]:
     return None
 
 
-def request_main_suite(etos: ETOS, main_suite_id: str) -> Optional[dict]:
-    """Request a test suite started event from graphql.
+def request_main_suites(etos: ETOS, main_suite_ids: list[str]) -> dict[str, dict]:
+    """Request several test suite started events from graphql in a single query.
 
     :param etos: ETOS library instance.
-    :param main_suite_id: ID of main suite to get from ER.
-    :return: Response from graphql or None
+    :param main_suite_ids: IDs of the main suites to get from ER.
+    :return: The test suite started events that were found, keyed by their IDs.
     """
     query = """
 {
-  testSuiteStarted(last: 1, search: "{'meta.id': '%s'}") {
+  testSuiteStarted(last: %d, search: "{'meta.id': {'$in': [%s]}}") {
     edges {
       node {
         meta {
@@ -182,13 +182,13 @@ def request_main_suite(etos: ETOS, main_suite_id: str) -> Optional[dict]:
   }
 }
     """
-    for response in request(etos, query % main_suite_id):
+    ids = ", ".join(f"'{main_suite_id}'" for main_suite_id in main_suite_ids)
+    for response in request(etos, query % (len(main_suite_ids), ids)):
         if response:
-            try:
-                _, test_suite_started = next(
-                    etos.graphql.search_for_nodes(response, "testSuiteStarted")
+            return {
+                test_suite_started["meta"]["id"]: test_suite_started
+                for _, test_suite_started in etos.graphql.search_for_nodes(
+                    response, "testSuiteStarted"
                 )
-            except StopIteration:
-                return None
-            return test_suite_started
-    return None
+            }
+    return {}
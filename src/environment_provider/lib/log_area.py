@@ -56,6 +56,37 @@ class LogArea:  # pylint:disable=too-few-public-methods
         :param sub_suite_id: Second part of folder to upload to.
         :return: URI where log was uploaded to.
         """
+        with open(log, "rb") as log_file:
+            return self.__upload_with_retry(log, log_file, name, main_suite_id, sub_suite_id)
+
+    def upload_bytes(self, payload: bytes, name: str, main_suite_id: str, sub_suite_id: str) -> str:
+        """Upload data from memory to a storage location.
+
+        :param payload: Data to upload.
+        :param name: Name of file to upload.
+        :param main_suite_id: First part of folder to upload to.
+        :param sub_suite_id: Second part of folder to upload to.
+        :return: URI where data was uploaded to.
+        """
+        return self.__upload_with_retry(name, payload, name, main_suite_id, sub_suite_id)
+
+    def __upload_with_retry(
+        self,
+        log: str,
+        log_data: Union[IO, bytes],
+        name: str,
+        main_suite_id: str,
+        sub_suite_id: str,
+    ) -> str:
+        """Upload a log to a storage location, retrying a few times on failure.
+
+        :param log: Description of the log to upload, used for logging.
+        :param log_data: Opened log file, or data, to upload.
+        :param name: Name of file to upload.
+        :param main_suite_id: First part of folder to upload to.
+        :param sub_suite_id: Second part of folder to upload to.
+        :return: URI where log was uploaded to.
+        """
         upload = deepcopy(self.log_area.get("upload"))
         data = {"name": name, "main_suite_id": main_suite_id, "sub_suite_id": sub_suite_id}
 
@@ -67,28 +98,27 @@ class LogArea:  # pylint:disable=too-few-public-methods
         if upload.get("auth"):
             upload["auth"] = self.__auth(**upload["auth"])
 
-        with open(log, "rb") as log_file:
-            for _ in range(3):
-                try:
-                    response = self.__upload(log_file=log_file, **upload)
-                    self.logger.debug("%r", response)
-                    if not upload.get("as_json", True):
-                        self.logger.debug("%r", response.text)
-                    self.logger.info("Uploaded log %r.", log)
-                    self.logger.info("Upload URI          %r", upload["url"])
-                    self.logger.info("Data:               %r", data)
-                    break
-                except:  # noqa pylint:disable=bare-except
-                    self.logger.error("%r", traceback.format_exc())
-                    self.logger.error("Failed to upload log!")
-                    self.logger.error("Attempted upload of %r", log)
+        for _ in range(3):
+            try:
+                response = self.__upload(log_file=log_data, **upload)
+                self.logger.debug("%r", response)
+                if not upload.get("as_json", True):
+                    self.logger.debug("%r", response.text)
+                self.logger.info("Uploaded log %r.", log)
+                self.logger.info("Upload URI          %r", upload["url"])
+                self.logger.info("Data:               %r", data)
+                break
+            except:  # noqa pylint:disable=bare-except
+                self.logger.error("%r", traceback.format_exc())
+                self.logger.error("Failed to upload log!")
+                self.logger.error("Attempted upload of %r", log)
         return upload["url"]
 
     def __upload(
         self,
         verb: str,
         url: str,
-        log_file: IO,
+        log_file: Union[IO, bytes],
         timeout: Optional[int] = None,
         as_json: bool = True,
         **requests_kwargs: dict,
@@ -98,7 +128,7 @@ class LogArea:  # pylint:disable=too-few-public-methods
         :param verb: Which HTTP verb to use. GET, PUT, POST
                      (DELETE omitted)
         :param url: URL to retry upload request
-        :param log_file: Opened log file to upload.
+        :param log_file: Opened log file, or data, to upload.
         :param timeout: How long, in seconds, to retry request.
         :param as_json: Whether or not to return json instead of response.
         :param request_kwargs: Keyword arguments for the requests command.
@@ -16,8 +16,10 @@
 """ETOS Environment Provider registry module."""
 import json
 import logging
+import time
 from collections import OrderedDict
-from typing import Optional
+from threading import Event, Thread
+from typing import Any, Optional
 
 import jsonschema
 from etos_lib.etos import ETOS
@@ -52,26 +54,54 @@ class ProviderRegistry:
             self.testrun = None
         self.providers = ETCDPath("/environment/provider")
         self.etos.config.set("PROVIDERS", [])
+        self._provider_cache: dict[str, bytes] = {}
+        self._provider_instances: dict[str, Any] = {}
 
     def is_configured(self) -> bool:
         """Check that there is a configuration for the given suite ID.
 
         :return: Whether or not a configuration exists for the suite ID.
         """
-        configuration = self.testrun.join("provider").read_all()
-        return bool(configuration)
+        return self.testrun.join("provider/").exists()
 
     def wait_for_configuration(self) -> bool:
         """Wait for ProviderRegistry to become configured.
 
         :return: Whether or not a configuration exists for the suite ID.
         """
-        generator = self.etos.utils.wait(self.is_configured)
-        result = None
-        for result in generator:
-            if result:
-                break
-        return result
+        if self.__check_configured():
+            return True
+        # Watch the configuration in order to check it as soon as it changes. It is still
+        # checked periodically, in case a change is made before the watch has started.
+        changed = Event()
+        events, cancel = self.testrun.join("provider/").watch_prefix()
+
+        def watch() -> None:
+            for _ in events:
+                changed.set()
+
+        Thread(target=watch, daemon=True).start()
+        try:
+            end = time.time() + self.etos.debug.default_wait_timeout
+            while time.time() < end:
+                changed.wait(min(5, max(end - time.time(), 0)))
+                changed.clear()
+                if self.__check_configured():
+                    return True
+            return False
+        finally:
+            cancel()
+
+    def __check_configured(self) -> bool:
+        """Check that there is a configuration for the given suite ID, ignoring any failures.
+
+        :return: Whether or not a configuration exists for the suite ID.
+        """
+        try:
+            return self.is_configured()
+        except Exception:  # pylint:disable=broad-except
+            self.logger.exception("Failed to check the configuration. Retrying..")
+            return False
 
     def validate(self, provider: dict, schema: str) -> dict:
         """Validate a provider JSON against schema.
@@ -86,6 +116,38 @@ class ProviderRegistry:
         jsonschema.validate(instance=provider, schema=schema)
         return provider
 
+    def _read_provider(self, provider_type: str) -> Optional[bytes]:
+        """Read a provider configuration for the testrun from the ETOS Database.
+
+        Providers do not change once they have been configured for a testrun, so they are
+        only read from the database once per registry. All providers are usually needed,
+        so they are all read with a single request.
+
+        :param provider_type: Type of provider to read, i.e. 'iut', 'log-area' or 'execution-space'.
+        :return: Provider JSON as stored in the database or None.
+        """
+        if provider_type not in self._provider_cache:
+            prefix = f"{self.testrun.join('provider')}/"
+            for provider, metadata in self.testrun.join("provider").read_all():
+                key = metadata.get("key", b"").decode()
+                if provider and key.startswith(prefix):
+                    self._provider_cache[key[len(prefix) :]] = provider
+        return self._provider_cache.get(provider_type)
+
+    def _provider_json(self, provider_type: str) -> Optional[dict]:
+        """Get a provider configuration for the testrun as JSON.
+
+        The JSON is parsed on every call, so that every caller gets its own copy. It is parsed
+        into OrderedDicts since JSONTas only accepts those.
+
+        :param provider_type: Type of provider to get, i.e. 'iut', 'log-area' or 'execution-space'.
+        :return: Provider JSON or None.
+        """
+        provider = self._read_provider(provider_type)
+        if provider:
+            return json.loads(provider, object_pairs_hook=OrderedDict)
+        return None
+
     def get_log_area_provider(self) -> Optional[dict]:
         """Get log area provider for a testrun from the ETOS Database.
 
@@ -96,10 +158,7 @@ class ProviderRegistry:
                 "Could not retrieve log area provider from database, testrun is not set."
             )
             return None
-        provider = self.testrun.join("provider/log-area").read()
-        if provider:
-            return json.loads(provider, object_pairs_hook=OrderedDict)
-        return None
+        return self._provider_json("log-area")
 
     def get_iut_provider(self) -> Optional[dict]:
         """Get IUT provider for testrun from the ETOS Database.
@@ -109,10 +168,7 @@ class ProviderRegistry:
         if self.testrun is None:
             self.logger.error("Could not retrieve IUT provider from database, testrun is not set.")
             return None
-        provider = self.testrun.join("provider/iut").read()
-        if provider:
-            return json.loads(provider, object_pairs_hook=OrderedDict)
-        return None
+        return self._provider_json("iut")
 
     def get_execution_space_provider(self) -> Optional[dict]:
         """Get execution space provider by name from the ETOS Database.
@@ -124,58 +180,48 @@ class ProviderRegistry:
                 "Could not retrieve execution space provider from database, testrun is not set."
             )
             return None
-        provider = self.testrun.join("provider/execution-space").read()
-        if provider:
-            return json.loads(provider, object_pairs_hook=OrderedDict)
-        return None
+        return self._provider_json("execution-space")
+
+    def _provider(self, provider_type: str, provider_class: type, name: str) -> Any:
+        """Get a provider object configured to suite ID.
+
+        The provider is only created once per registry, so that it is only added once to the
+        providers to check in when cleaning up.
+
+        :param provider_type: Type of provider to get, i.e. 'iut', 'log-area' or 'execution-space'.
+        :param provider_class: Class to create the provider object with.
+        :param name: Name of the ruleset in the provider JSON.
+        :return: Provider object or None.
+        """
+        if provider_type not in self._provider_instances:
+            provider_json = self._provider_json(provider_type)
+            if not provider_json:
+                return None
+            provider = provider_class(self.etos, self.jsontas, provider_json.get(name))
+            self.etos.config.get("PROVIDERS").append(provider)
+            self._provider_instances[provider_type] = provider
+        return self._provider_instances[provider_type]
 
     def execution_space_provider(self) -> Optional[ExecutionSpaceProvider]:
         """Get the execution space provider configured to suite ID.
 
         :return: Execution space provider object.
         """
-        provider_json = self.testrun.join("provider/execution-space").read()
-        if provider_json:
-            provider = ExecutionSpaceProvider(
-                self.etos,
-                self.jsontas,
-                json.loads(provider_json, object_pairs_hook=OrderedDict).get("execution_space"),
-            )
-            self.etos.config.get("PROVIDERS").append(provider)
-            return provider
-        return None
+        return self._provider("execution-space", ExecutionSpaceProvider, "execution_space")
 
     def iut_provider(self) -> Optional[IutProvider]:
         """Get the IUT provider configured to suite ID.
 
         :return: IUT provider object.
         """
-        provider_json = self.testrun.join("provider/iut").read()
-        if provider_json:
-            provider = IutProvider(
-                self.etos,
-                self.jsontas,
-                json.loads(provider_json, object_pairs_hook=OrderedDict).get("iut"),
-            )
-            self.etos.config.get("PROVIDERS").append(provider)
-            return provider
-        return None
+        return self._provider("iut", IutProvider, "iut")
 
     def log_area_provider(self) -> Optional[LogAreaProvider]:
         """Get the log area provider configured to suite ID.
 
         :return: Log area provider object.
         """
-        provider_json = self.testrun.join("provider/log-area").read()
-        if provider_json:
-            provider = LogAreaProvider(
-                self.etos,
-                self.jsontas,
-                json.loads(provider_json, object_pairs_hook=OrderedDict).get("log"),
-            )
-            self.etos.config.get("PROVIDERS").append(provider)
-            return provider
-        return None
+        return self._provider("log-area", LogAreaProvider, "log")
 
     def dataset(self) -> Optional[dict]:
         """Get the dataset configured to suite ID.
@@ -47,7 +47,7 @@ class Splitter:
 
         :param test_suite: Test suite to iterate IUTs for.
         """
-        test_list = self._iterator(deepcopy(test_suite.get("unsplit_recipes")))
+        test_list = self._iterator(list(test_suite.get("unsplit_recipes")))
         while True:
             try:
                 for _, iut_dict in test_suite.get("iuts").items():
@@ -318,9 +318,11 @@ class ExternalProvider:
         """
         span = opentelemetry.trace.get_current_span()
         self.logger.debug("Checking response from external execution space provider")
+        body = None
         try:
-            if response.json().get("error") is not None:
-                self.logger.error(response.json().get("error"))
+            body = response.json()
+            if body.get("error") is not None:
+                self.logger.error(body.get("error"))
         except JSONDecodeError:
             self.logger.error("Could not parse response as JSON")
 
@@ -339,7 +341,9 @@ class ExternalProvider:
 
         # This should work, no other errors found.
         # If this does not work, propagate JSONDecodeError up the stack.
-        self.logger.debug("Status for response %r", response.json().get("status"))
+        if body is None:
+            body = response.json()
+        self.logger.debug("Status for response %r", body.get("status"))
 
     def build_execution_spaces(self, response: dict) -> list[ExecutionSpace]:
         """Build execution space objects from external execution space provider response.
@@ -15,7 +15,6 @@
 # limitations under the License.
 """Execution space provider instructions module."""
 import os
-from copy import deepcopy
 from uuid import uuid4
 
 from jsontas.data_structures.datastructure import DataStructure
@@ -29,12 +28,20 @@ class Instructions(DataStructure):  # pylint:disable=too-few-public-methods
 
         :return: Name of key and execution space spin-up instructions.
         """
-        instructions = deepcopy(self.datasubset.get("instructions"))
-        instructions["environment"].update(self.data.get("environment", {}))
-        instructions["parameters"].update(self.data.get("parameters", {}))
-        instructions["image"] = self.data.get("image", instructions["image"])
-        instructions["identifier"] = str(uuid4())
-        instructions["environment"]["ENVIRONMENT_ID"] = str(uuid4())
+        # Only the environment and parameters of the instructions template are updated,
+        # so there is no need to copy the whole template.
+        template = self.datasubset.get("instructions")
+        instructions = {
+            **template,
+            "environment": {
+                **template["environment"],
+                **self.data.get("environment", {}),
+                "ENVIRONMENT_ID": f"{uuid4()}",
+            },
+            "parameters": {**template["parameters"], **self.data.get("parameters", {})},
+            "image": self.data.get("image", template["image"]),
+            "identifier": f"{uuid4()}",
+        }
         if instructions["environment"].get("ETR_VERSION") is None:
             instructions["environment"]["ETR_VERSION"] = os.getenv("ETR_VERSION")
         self.add_feature_flags(instructions)
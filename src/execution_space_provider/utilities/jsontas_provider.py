@@ -20,6 +20,8 @@ import time
 from etos_lib import ETOS
 from jsontas.jsontas import JsonTas
 
+from environment_provider.lib.backoff import backoff
+
 from ..exceptions import (
     ExecutionSpaceCheckoutFailed,
     ExecutionSpaceNotAvailable,
@@ -96,12 +98,7 @@ class JSONTasProvider:
         :return: List of checked out execution spaces.
         """
         timeout = time.time() + self.etos.config.get("WAIT_FOR_EXECUTION_SPACE_TIMEOUT")
-        first_iteration = True
-        while time.time() < timeout:
-            if first_iteration:
-                first_iteration = False
-            else:
-                time.sleep(5)
+        for _ in backoff(timeout):
             try:
                 available_execution_spaces = self.list_execution_spaces(maximum_amount)
                 self.logger.info("Available execution spaces:")
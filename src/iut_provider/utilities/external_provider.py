@@ -253,9 +253,11 @@ class ExternalProvider:
         :param response: The response from the external IUT provider.
         """
         self.logger.debug("Checking response from external IUT provider")
+        body = None
         try:
-            if response.json().get("error") is not None:
-                self.logger.error(response.json().get("error"))
+            body = response.json()
+            if body.get("error") is not None:
+                self.logger.error(body.get("error"))
         except JSONDecodeError:
             self.logger.error("Could not parse response as JSON")
 
@@ -266,7 +268,9 @@ class ExternalProvider:
 
         # This should work, no other errors found.
         # If this does not work, propagate JSONDecodeError up the stack.
-        self.logger.debug("Status for response %r", response.json().get("status"))
+        if body is None:
+            body = response.json()
+        self.logger.debug("Status for response %r", body.get("status"))
 
     def build_iuts(self, response: dict) -> list[Iut]:
         """Build IUT objects from external IUT provider response.
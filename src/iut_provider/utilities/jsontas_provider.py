@@ -21,6 +21,8 @@ from etos_lib import ETOS
 from jsontas.jsontas import JsonTas
 from packageurl import PackageURL
 
+from environment_provider.lib.backoff import backoff
+
 from ..exceptions import IutCheckoutFailed, IutNotAvailable, NoIutFound, NotEnoughIutsAvailable
 from ..iut import Iut
 from .checkin import Checkin
@@ -128,12 +130,7 @@ class JSONTasProvider:
         timeout = time.time() + self.etos.config.get("WAIT_FOR_IUT_TIMEOUT")
         last_exception = None
         prepared_iuts = []
-        first_iteration = True
-        while time.time() < timeout:
-            if first_iteration:
-                first_iteration = False
-            else:
-                time.sleep(5)
+        for _ in backoff(timeout):
             try:
                 available_iuts = self.list_iuts(maximum_amount)
                 self.logger.info("Available IUTs:")
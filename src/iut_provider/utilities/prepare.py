@@ -18,9 +18,9 @@ import logging
 from collections import OrderedDict
 from copy import deepcopy
 from multiprocessing.pool import ThreadPool
-from threading import Lock
 
 from etos_lib.logging.logger import FORMAT_CONFIG
+from jsontas.dataset import Dataset
 from jsontas.jsontas import JsonTas
 
 from ..iut import Iut
@@ -30,7 +30,6 @@ class Prepare:  # pylint:disable=too-few-public-methods
     """Prepare and add preparation configuration for ETR to use to item under test (IUT)."""
 
     logger = logging.getLogger("IUTProvider - Prepare")
-    lock = Lock()
 
     def __init__(self, jsontas: JsonTas, prepare_ruleset: dict) -> None:
         """Initialize IUT preparation handler.
@@ -43,16 +42,17 @@ class Prepare:  # pylint:disable=too-few-public-methods
         self.dataset = self.jsontas.dataset
         self.suite_id = self.dataset.get("config", {}).get("SUITE_ID")
 
-    def execute_preparation_steps(self, iut: Iut, preparation_steps: dict) -> tuple[bool, Iut]:
+    def execute_preparation_steps(
+        self, iut: Iut, preparation_steps: dict, dataset: Dataset
+    ) -> tuple[bool, Iut]:
         """Execute the preparation steps for the environment provider on an IUT.
 
         :param iut: IUT to prepare for execution.
         :param preparation_steps: Steps to execute to prepare an IUT.
+        :param dataset: Copy of the dataset, owned by this preparation, to run the steps with.
         """
         FORMAT_CONFIG.identifier = self.suite_id
         try:
-            with self.lock:
-                dataset = self.dataset.copy()
             jsontas = JsonTas(dataset=dataset)
             steps = {}
             dataset.add("iut", iut)
@@ -94,7 +94,7 @@ class Prepare:  # pylint:disable=too-few-public-methods
             results.append(
                 thread_pool.apply_async(
                     self.execute_preparation_steps,
-                    args=(iut, deepcopy(steps)),
+                    args=(iut, deepcopy(steps), self.dataset.copy()),
                 )
             )
         for result in results:
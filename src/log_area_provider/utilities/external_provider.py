@@ -263,9 +263,11 @@ class ExternalProvider:
         :param response: The response from the external log area provider.
         """
         self.logger.debug("Checking response from external log area provider")
+        body = None
         try:
-            if response.json().get("error") is not None:
-                self.logger.error(response.json().get("error"))
+            body = response.json()
+            if body.get("error") is not None:
+                self.logger.error(body.get("error"))
         except JSONDecodeError:
             self.logger.error("Could not parse response as JSON")
 
@@ -280,7 +282,9 @@ class ExternalProvider:
 
         # This should work, no other errors found.
         # If this does not work, propagate JSONDecodeError up the stack.
-        self.logger.debug("Status for response %r", response.json().get("status"))
+        if body is None:
+            body = response.json()
+        self.logger.debug("Status for response %r", body.get("status"))
 
     def build_log_areas(self, response: dict) -> list[LogArea]:
         """Build log area objects from external log area provider response.
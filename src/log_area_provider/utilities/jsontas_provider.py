@@ -20,6 +20,8 @@ import time
 from etos_lib import ETOS
 from jsontas.jsontas import JsonTas
 
+from environment_provider.lib.backoff import backoff
+
 from ..exceptions import (
     LogAreaCheckoutFailed,
     LogAreaNotAvailable,
@@ -95,12 +97,7 @@ class JSONTasProvider:
         :return: List of checked out log areas.
         """
         timeout = time.time() + self.etos.config.get("WAIT_FOR_LOG_AREA_TIMEOUT")
-        first_iteration = True
-        while time.time() < timeout:
-            if first_iteration:
-                first_iteration = False
-            else:
-                time.sleep(5)
+        for _ in backoff(timeout):
             try:
                 available_log_areas = self.list_log_areas(maximum_amount)
                 self.logger.info("Available log areas:")
@@ -0,0 +1,128 @@
+# Copyright Axis Communications AB.
+#
+# For a full list of individual contributors, please see the commit history.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the ETCD database helpers."""
+import base64
+import logging
+import unittest
+
+from mock import patch
+
+from etos_lib.lib.config import Config
+
+from environment_provider.lib.database import MAX_TRANSACTION_OPERATIONS, ETCDPath
+from tests.library.fake_database import FakeDatabase
+
+
+class TestETCDPath(unittest.TestCase):
+    """Test the ETCD path helper."""
+
+    logger = logging.getLogger(__name__)
+
+    def setUp(self):
+        """Set up a fake database."""
+        self.database = FakeDatabase()
+        Config().set("database", self.database)
+
+    def tearDown(self):
+        """Reset all globally stored data for the next test."""
+        Config().reset()
+
+    def test_exists(self):
+        """Test that exists only finds keys "below" the path.
+
+        Approval criteria:
+            - Exists shall return False if there are only keys outside of the path.
+            - Exists shall return True if there is a key "below" the path.
+
+        Test steps::
+            1. Write keys next to, but not below, the path.
+            2. Verify that the path does not exist.
+            3. Write a key below the path.
+            4. Verify that the path exists.
+        """
+        path = ETCDPath("/testrun/suite-id/provider/")
+
+        self.logger.info("STEP: Write keys next to, but not below, the path.")
+        self.database.put("/testrun/suite-id/provider", "not below the path")
+        self.database.put("/testrun/suite-id/tercc", "after the path")
+        self.database.put("/testrun/other-suite-id/provider/iut", "another testrun")
+
+        self.logger.info("STEP: Verify that the path does not exist.")
+        self.assertFalse(path.exists())
+
+        self.logger.info("STEP: Write a key below the path.")
+        self.database.put("/testrun/suite-id/provider/iut", "{}")
+
+        self.logger.info("STEP: Verify that the path exists.")
+        self.assertTrue(path.exists())
+
+    def test_exists_encoded_range_end(self):
+        """Test that exists encodes the range end for etcd3gw versions that do not.
+
+        Approval criteria:
+            - The range end shall be base64 encoded if etcd3gw does not encode it.
+
+        Test steps::
+            1. Check if a path exists, with an etcd3gw that does not encode the range end.
+            2. Verify that the range end was encoded.
+        """
+        path = ETCDPath("/testrun/suite-id/provider/")
+
+        self.logger.info(
+            "STEP: Check if a path exists, with an etcd3gw that does not encode the range end."
+        )
+        with patch("environment_provider.lib.database.GET_ENCODES_RANGE_END", False):
+            with patch.object(self.database, "get", return_value=[]) as get:
+                self.assertFalse(path.exists())
+
+        self.logger.info("STEP: Verify that the range end was encoded.")
+        get.assert_called_once_with(
+            "/testrun/suite-id/provider/",
+            range_end=base64.b64encode(b"/testrun/suite-id/provider0").decode(),
+            limit=1,
+        )
+
+    def test_write_many(self):
+        """Test that write_many writes more keys than fit in a single transaction.
+
+        Approval criteria:
+            - All keys shall be written "below" the path.
+            - No transaction shall have more operations than ETCD allows.
+
+        Test steps::
+            1. Write more keys than fit in a single transaction.
+            2. Verify that the keys were split over several transactions.
+            3. Verify that all keys can be read back.
+        """
+        path = ETCDPath("/testrun/suite-id")
+        values = {f"suite/{index}/subsuite": f"value {index}" for index in range(300)}
+
+        self.logger.info("STEP: Write more keys than fit in a single transaction.")
+        with patch.object(
+            self.database, "transaction", wraps=self.database.transaction
+        ) as transaction:
+            path.write_many(values)
+
+        self.logger.info("STEP: Verify that the keys were split over several transactions.")
+        sizes = [len(call.args[0]["success"]) for call in transaction.call_args_list]
+        self.assertEqual(sizes, [MAX_TRANSACTION_OPERATIONS, MAX_TRANSACTION_OPERATIONS, 44])
+
+        self.logger.info("STEP: Verify that all keys can be read back.")
+        self.assertEqual(
+            {metadata["key"].decode(): value.decode() for value, metadata in path.read_all()},
+            {f"/testrun/suite-id/{key}": value for key, value in values.items()},
+        )
+        self.assertEqual(path.join("suite/299/subsuite").read(), b"value 299")
@@ -0,0 +1,84 @@
+# Copyright Axis Communications AB.
+#
+# For a full list of individual contributors, please see the commit history.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the GraphQL requests."""
+import functools
+import logging
+import os
+import unittest
+
+from mock import patch
+
+from etos_lib import ETOS
+
+from environment_provider.lib.graphql import request_main_suites
+from tests.library.fake_server import FakeServer
+from tests.library.graphql_handler import GraphQLHandler
+
+FOUND = ["0ddbc0ec-2e3a-4b17-8d6f-3e9e2ff0a5a1", "7f2ab1e5-0c4d-4a25-9d2a-8b1f6c4e3d2b"]
+MISSING = "c5f3a4b2-6e7d-4f8a-9b0c-1d2e3f4a5b6c"
+
+
+class MainSuiteHandler(GraphQLHandler):
+    """GraphQL handler that only knows of some of the requested main suites."""
+
+    def test_suite_started(self, request_data):
+        """Create fake test suite started events for the requested IDs that are found.
+
+        :param request_data: Data to parse the requested IDs from.
+        :type request_data: byte
+        :return: A graphql response with test suite started events.
+        :rtype dict
+        """
+        response = super().test_suite_started(request_data)
+        response["data"]["testSuiteStarted"]["edges"] = [
+            edge
+            for edge in response["data"]["testSuiteStarted"]["edges"]
+            if edge["node"]["meta"]["id"] in FOUND
+        ]
+        return response
+
+
+class TestGraphQL(unittest.TestCase):
+    """Test the GraphQL requests."""
+
+    logger = logging.getLogger(__name__)
+
+    def test_request_main_suites(self):
+        """Test that several main suites can be requested in a single query.
+
+        Approval criteria:
+            - The main suites that are found shall be returned, keyed by their IDs.
+            - Main suites that are not found shall not be returned.
+
+        Test steps::
+            1. Start up a fake server that knows of all but one of the main suites.
+            2. Request all main suites.
+            3. Verify that only the main suites that were found are returned.
+        """
+        self.logger.info(
+            "STEP: Start up a fake server that knows of all but one of the main suites."
+        )
+        handler = functools.partial(MainSuiteHandler, {})
+        with FakeServer(None, None, handler) as server:
+            with patch.dict(os.environ, {"ETOS_GRAPHQL_SERVER": server.host}):
+                etos = ETOS("testing_etos", "testing_etos", "testing_etos")
+                self.logger.info("STEP: Request all main suites.")
+                main_suites = request_main_suites(etos, [*FOUND, MISSING])
+
+        self.logger.info("STEP: Verify that only the main suites that were found are returned.")
+        self.assertDictEqual(
+            main_suites, {main_suite_id: {"meta": {"id": main_suite_id}} for main_suite_id in FOUND}
+        )
@@ -0,0 +1,98 @@
+# Copyright Axis Communications AB.
+#
+# For a full list of individual contributors, please see the commit history.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the provider registry."""
+import logging
+import os
+import time
+import unittest
+from threading import Timer
+
+from mock import patch
+
+from etos_lib import ETOS
+from etos_lib.lib.config import Config
+from jsontas.jsontas import JsonTas
+
+from environment_provider.lib.registry import ProviderRegistry
+from tests.library.fake_database import FakeDatabase
+
+
+class TestProviderRegistry(unittest.TestCase):
+    """Test the provider registry."""
+
+    logger = logging.getLogger(__name__)
+
+    def setUp(self):
+        """Set up a fake database and a registry."""
+        self.database = FakeDatabase()
+        Config().set("database", self.database)
+        etos = ETOS("testing_etos", "testing_etos", "testing_etos")
+        self.registry = ProviderRegistry(etos, JsonTas(), "suite-id")
+
+    def tearDown(self):
+        """Reset all globally stored data for the next test."""
+        Config().reset()
+
+    @patch.dict(os.environ, {"ETOS_DEFAULT_WAIT_TIMEOUT": "20"})
+    def test_wait_for_configuration(self):
+        """Test that the registry stops waiting as soon as it is configured.
+
+        Approval criteria:
+            - The configuration shall be found when it is written after the wait started.
+            - The wait shall not be limited by the periodic check.
+
+        Test steps::
+            1. Write a provider configuration shortly after starting to wait.
+            2. Verify that the registry was configured before the periodic check.
+        """
+        self.logger.info("STEP: Write a provider configuration shortly after starting to wait.")
+        timer = Timer(0.5, self.database.put, args=("/testrun/suite-id/provider/iut", "{}"))
+        timer.start()
+        start = time.time()
+        try:
+            configured = self.registry.wait_for_configuration()
+        finally:
+            timer.cancel()
+
+        self.logger.info("STEP: Verify that the registry was configured before the periodic check.")
+        self.assertTrue(configured)
+        self.assertLess(time.time() - start, 4)
+
+    @patch.dict(os.environ, {"ETOS_DEFAULT_WAIT_TIMEOUT": "1"})
+    def test_wait_for_configuration_timeout(self):
+        """Test that the registry stops waiting when there is no configuration.
+
+        Approval criteria:
+            - The registry shall not be configured if only other testruns are configured.
+            - The wait shall stop at the timeout.
+
+        Test steps::
+            1. Write a provider configuration for another testrun while waiting.
+            2. Verify that the registry was not configured after the timeout.
+        """
+        self.logger.info("STEP: Write a provider configuration for another testrun while waiting.")
+        timer = Timer(0.2, self.database.put, args=("/testrun/other-suite-id/provider/iut", "{}"))
+        timer.start()
+        start = time.time()
+        try:
+            configured = self.registry.wait_for_configuration()
+        finally:
+            timer.cancel()
+
+        self.logger.info("STEP: Verify that the registry was not configured after the timeout.")
+        self.assertFalse(configured)
+        self.assertGreaterEqual(time.time() - start, 1)
+        self.assertLess(time.time() - start, 4)
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Fake database library helpers."""
+import base64
 from queue import Queue
 from threading import Event, RLock, Timer
 from typing import Any, Iterator, Optional
@@ -79,6 +80,13 @@ class FakeDatabase:
             self.db_dict[item].append(str(value).encode())
         self.__event({"kv": {"key": item.encode(), "value": str(value).encode()}})
 
+    def transaction(self, txn: dict) -> dict:
+        """Run the put requests of a transaction."""
+        for request in txn.get("success", []):
+            put = request["request_put"]
+            self.put(base64.b64decode(put["key"]).decode(), base64.b64decode(put["value"]).decode())
+        return {"succeeded": True}
+
     def lease(self, ttl=30) -> Lease:
         """Create a lease."""
         with self.lock:
@@ -88,10 +96,16 @@ class FakeDatabase:
         # etcd server.
         return Lease(len(self.expire) - 1)
 
-    def get(self, path: str) -> list[bytes]:
-        """Get an item from database."""
+    def get(self, path: str, range_end: Optional[str] = None, limit: int = 0) -> list[bytes]:
+        """Get an item, or the items in a range if range_end is set, from database."""
         if isinstance(path, bytes):
             path = path.decode()
+        if range_end is not None:
+            with self.lock:
+                values = [
+                    value[-1] for key, value in self.db_dict.items() if path <= key < range_end
+                ]
+            return values[:limit] if limit else values
         with self.lock:
             return list(reversed(self.db_dict.get(path, [])))
 
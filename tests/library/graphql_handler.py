@@ -15,6 +15,7 @@
 # limitations under the License.
 """Handler for graphql queries."""
 import json
+import re
 from http.server import BaseHTTPRequestHandler
 
 from graphql import parse
@@ -129,16 +130,20 @@ class GraphQLHandler(BaseHTTPRequestHandler):
             }
         }
 
-    def test_suite_started(self):
-        """Create a fake test suite started to simulate ESR.
+    def test_suite_started(self, request_data):
+        """Create fake test suite started events, for all requested IDs, to simulate ESR.
 
-        :return: A graphql response with a test suite started event.
+        :param request_data: Data to parse the requested IDs from.
+        :type request_data: byte
+        :return: A graphql response with test suite started events.
         :rtype dict
         """
+        query = json.loads(request_data)["query"]
+        ids = re.findall(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", query)
         return {
             "data": {
                 "testSuiteStarted": {
-                    "edges": [{"node": {"meta": {"id": "3d1cab0e-dacb-4991-afac-7581eea4a3df"}}}]
+                    "edges": [{"node": {"meta": {"id": main_suite_id}}} for main_suite_id in ids]
                 }
             }
         }
@@ -155,7 +160,7 @@ class GraphQLHandler(BaseHTTPRequestHandler):
         elif query_name == "artifactPublished":
             response = self.artifact_published()
         elif query_name == "testSuiteStarted":
-            response = self.test_suite_started()
+            response = self.test_suite_started(request_data)
         else:
             response = None
 
@@ -18,11 +18,17 @@ import functools
 import json
 import logging
 import os
+import threading
 import unittest
 from mock import patch
 
+from etos_lib.kubernetes.schemas import EnvironmentRequest as EnvironmentRequestSchema
+from etos_lib.kubernetes.schemas import Provider as ProviderSchema
+from etos_lib.kubernetes.schemas.common import OwnerReference
 from etos_lib.lib.config import Config
 from etos_lib.lib.debug import Debug
+from jsontas.jsontas import JsonTas
+from opentelemetry import trace
 
 from environment_provider.environment_provider import EnvironmentProvider
 from tests.library.fake_database import FakeDatabase
@@ -106,6 +112,54 @@ LOG_AREA_PROVIDER = {
 }
 
 
+class FakeExternalProvider:
+    """Fake external provider, checking out items for the IUT in its dataset."""
+
+    barrier = None
+    failing = {}
+    checked_in = []
+
+    def __init__(self, _, jsontas, ruleset):
+        """Store dataset and ruleset like the external providers do."""
+        self.dataset = jsontas.dataset
+        self.ruleset = ruleset
+
+    def _checkout(self, key):
+        """Check out an item for the IUT and store it in the dataset, like external providers."""
+        iut = self.dataset.get("iut")
+        if self.failing.get(key) == iut:
+            raise RuntimeError(f"Failed to check out {key} for {iut}")
+        self.dataset.add(key, [{"iut": iut}])
+        return self.dataset.get(key)
+
+    def wait_for_and_checkout_execution_spaces(self, *_):
+        """Check out an execution space for the IUT, waiting for all other checkouts."""
+        self.barrier.wait()
+        return self._checkout("execution_spaces")
+
+    def wait_for_and_checkout_log_areas(self, *_):
+        """Check out a log area for the IUT."""
+        return self._checkout("logs")
+
+
+class FakeExecutionSpaceProvider(FakeExternalProvider):
+    """Fake external execution space provider."""
+
+    def checkin_all(self):
+        """Check in all execution spaces stored in the dataset."""
+        for item in self.dataset.get("execution_spaces") or []:
+            self.checked_in.append(("execution_spaces", item["iut"]))
+
+
+class FakeLogAreaProvider(FakeExternalProvider):
+    """Fake external log area provider."""
+
+    def checkin_all(self):
+        """Check in all log areas stored in the dataset."""
+        for item in self.dataset.get("logs") or []:
+            self.checked_in.append(("logs", item["iut"]))
+
+
 class TestEnvironmentProvider(unittest.TestCase):
     """Scenario tests for the environment provider."""
 
@@ -331,3 +385,365 @@ class TestEnvironmentProvider(unittest.TestCase):
             if event.meta.type == "EiffelEnvironmentDefinedEvent":
                 environments.append(event)
         self.assertEqual(len(environments), 2)
+
+
+@patch("environment_provider.environment_provider.LogAreaProvider", FakeLogAreaProvider)
+@patch(
+    "environment_provider.environment_provider.ExecutionSpaceProvider", FakeExecutionSpaceProvider
+)
+class TestConcurrentCheckout(unittest.TestCase):
+    """Tests for checking out execution spaces and log areas concurrently."""
+
+    logger = logging.getLogger(__name__)
+
+    def setUp(self):
+        """Create an environment provider with external providers."""
+        self.iuts = {"iut1": {}, "iut2": {}, "iut3": {}}
+        FakeExternalProvider.barrier = threading.Barrier(len(self.iuts), timeout=10)
+        FakeExternalProvider.failing = {}
+        FakeExternalProvider.checked_in.clear()
+        self.environment_provider = EnvironmentProvider.__new__(EnvironmentProvider)
+        self.environment_provider.etos = None
+        self.environment_provider.tracer = trace.get_tracer(__name__)
+        self.environment_provider.dataset = JsonTas().dataset
+        self.environment_provider.execution_space_provider = FakeExecutionSpaceProvider(
+            None, JsonTas(), {"type": "external"}
+        )
+        self.environment_provider.log_area_provider = FakeLogAreaProvider(
+            None, JsonTas(), {"type": "external"}
+        )
+
+    def test_checkout_concurrently(self):
+        """Test that execution spaces and log areas are checked out concurrently for all IUTs.
+
+        Approval criteria:
+            - All IUTs shall be checked out at the same time.
+            - Every IUT shall get the execution space and log area checked out for it.
+            - The dataset shall be updated as if the IUTs were checked out sequentially.
+
+        Test steps::
+            1. Check out execution spaces and log areas concurrently for three IUTs.
+            2. Verify that every IUT got its own execution space and log area.
+            3. Verify that the dataset contains the last IUT.
+        """
+        self.logger.info(
+            "STEP: Check out execution spaces and log areas concurrently for three IUTs."
+        )
+        # pylint:disable=protected-access
+        self.assertTrue(self.environment_provider._can_checkout_concurrently())
+        self.environment_provider._checkout_concurrently("test_runner", self.iuts)
+
+        self.logger.info("STEP: Verify that every IUT got its own execution space and log area.")
+        for iut, suite in self.iuts.items():
+            self.assertEqual(suite["executor"], {"iut": iut})
+            self.assertEqual(suite["log_area"], {"iut": iut})
+            self.assertIn("sub_suite_id", suite)
+        self.assertEqual(len({suite["sub_suite_id"] for suite in self.iuts.values()}), 3)
+
+        self.logger.info("STEP: Verify that the dataset contains the last IUT.")
+        dataset = self.environment_provider.dataset
+        self.assertEqual(dataset.get("iut"), "iut3")
+        self.assertEqual(dataset.get("executor"), {"iut": "iut3"})
+        self.assertEqual(dataset.get("execution_spaces"), [{"iut": "iut3"}])
+        self.assertEqual(dataset.get("logs"), [{"iut": "iut3"}])
+
+    def test_checkout_concurrently_execution_space_failure(self):
+        """Test that a failed execution space checkout checks in the checkouts of all IUTs.
+
+        Approval criteria:
+            - The failure shall be raised.
+            - Everything that was checked out shall be checked in.
+            - The dataset shall not be updated.
+
+        Test steps::
+            1. Check out concurrently, failing the execution space checkout for one IUT.
+            2. Verify that the failure is raised.
+            3. Verify that everything that was checked out was checked in.
+            4. Verify that the dataset was not updated.
+        """
+        FakeExternalProvider.failing = {"execution_spaces": "iut2"}
+        self.logger.info(
+            "STEP: Check out concurrently, failing the execution space checkout for one IUT."
+        )
+        self.logger.info("STEP: Verify that the failure is raised.")
+        with self.assertRaises(RuntimeError):
+            # pylint:disable=protected-access
+            self.environment_provider._checkout_concurrently("test_runner", self.iuts)
+
+        self.logger.info("STEP: Verify that everything that was checked out was checked in.")
+        self.assertEqual(
+            sorted(FakeExternalProvider.checked_in),
+            [
+                ("execution_spaces", "iut1"),
+                ("execution_spaces", "iut3"),
+                ("logs", "iut1"),
+                ("logs", "iut3"),
+            ],
+        )
+
+        self.logger.info("STEP: Verify that the dataset was not updated.")
+        self.assertIsNone(self.environment_provider.dataset.get("iut"))
+        self.assertIsNone(self.environment_provider.dataset.get("execution_spaces"))
+
+    def test_checkout_concurrently_log_area_failure(self):
+        """Test that a failed log area checkout checks in the execution space of that IUT.
+
+        Approval criteria:
+            - The failure shall be raised.
+            - Everything that was checked out shall be checked in, including the execution
+              space of the IUT whose log area checkout failed.
+            - The dataset shall not be updated.
+
+        Test steps::
+            1. Check out concurrently, failing the log area checkout for one IUT.
+            2. Verify that the failure is raised.
+            3. Verify that everything that was checked out was checked in.
+            4. Verify that the dataset was not updated.
+        """
+        FakeExternalProvider.failing = {"logs": "iut2"}
+        self.logger.info("STEP: Check out concurrently, failing the log area checkout for one IUT.")
+        self.logger.info("STEP: Verify that the failure is raised.")
+        with self.assertRaises(RuntimeError):
+            # pylint:disable=protected-access
+            self.environment_provider._checkout_concurrently("test_runner", self.iuts)
+
+        self.logger.info("STEP: Verify that everything that was checked out was checked in.")
+        self.assertEqual(
+            sorted(FakeExternalProvider.checked_in),
+            [
+                ("execution_spaces", "iut1"),
+                ("execution_spaces", "iut2"),
+                ("execution_spaces", "iut3"),
+                ("logs", "iut1"),
+                ("logs", "iut3"),
+            ],
+        )
+        for iut in self.iuts.values():
+            self.assertNotIn("executor", iut)
+
+        self.logger.info("STEP: Verify that the dataset was not updated.")
+        self.assertIsNone(self.environment_provider.dataset.get("iut"))
+        self.assertIsNone(self.environment_provider.dataset.get("execution_spaces"))
+
+
+class TestControllerMode(unittest.TestCase):
+    """Tests for the environment provider when run by the ETOS kubernetes controller."""
+
+    logger = logging.getLogger(__name__)
+
+    def setUp(self):
+        """Create an environment provider and an environment request."""
+        self.environment_provider = EnvironmentProvider.__new__(EnvironmentProvider)
+        self.environment_provider.kubernetes = None
+        self.environment_provider.environment_client = None
+        self.environment_provider.owner_references = {}
+        self.request = EnvironmentRequestSchema.model_validate(
+            {
+                "metadata": {
+                    "name": "environment-request",
+                    "namespace": "etos",
+                    "uid": "environment-request-uid",
+                    "labels": {"app": "etos"},
+                    "ownerReferences": [
+                        {
+                            "apiVersion": "etos.eiffel-community.github.io/v1alpha1",
+                            "kind": "TestRun",
+                            "name": "testrun",
+                            "uid": "testrun-uid",
+                            "controller": True,
+                            "blockOwnerDeletion": True,
+                        }
+                    ],
+                },
+                "spec": {
+                    "id": "environment-request-id",
+                    "identifier": "tercc-id",
+                    "image": "environment-provider",
+                    "imagePullPolicy": "IfNotPresent",
+                    "artifact": "artifact-id",
+                    "identity": "pkg:testrun/etos/environment_provider",
+                    "minimumAmount": 1,
+                    "maximumAmount": 20,
+                    "providers": {},
+                    "splitter": {"tests": []},
+                },
+            }
+        )
+
+    @staticmethod
+    def _sub_suite(index: int) -> dict:
+        """Create a sub suite for an environment."""
+        return {
+            "name": f"suite_SubSuite_{index}",
+            "suite_id": "testrun-id",
+            "sub_suite_id": f"sub-suite-{index}",
+            "test_suite_started_id": "test-suite-started-id",
+            "artifact": "artifact-id",
+            "context": "context-id",
+            "priority": 1,
+            "test_runner": "test_runner",
+            "recipes": [],
+            "iut": {},
+            "executor": {
+                "instructions": {"environment": {"ENVIRONMENT_ID": f"environment-{index}"}}
+            },
+            "log_area": {},
+        }
+
+    @patch("environment_provider.environment_provider.Environment")
+    def test_create_environment_resources(self, environment_client):
+        """Test that environment resources are created concurrently for all sub suites.
+
+        Approval criteria:
+            - An Environment resource shall be created for every sub suite.
+            - Only a single environment client shall be created.
+            - The Environment resources shall be owned by the environment request.
+
+        Test steps::
+            1. Create environment resources for twenty sub suites.
+            2. Verify that an Environment resource was created for every sub suite.
+            3. Verify that only a single environment client was created.
+            4. Verify that the Environment resources are owned by the environment request.
+        """
+        environment_client.return_value.create.return_value = True
+        sub_suites = [self._sub_suite(index) for index in range(20)]
+
+        self.logger.info("STEP: Create environment resources for twenty sub suites.")
+        with patch.dict(os.environ, {"ETOS_API": "http://etos"}):
+            # pylint:disable=protected-access
+            environments = self.environment_provider._create_environment_resources(
+                self.request, sub_suites
+            )
+
+        self.logger.info(
+            "STEP: Verify that an Environment resource was created for every sub suite."
+        )
+        self.assertEqual(
+            [url for url, _ in environments],
+            [f"http://etos/v1alpha/testrun/environment-{index}" for index in range(20)],
+        )
+        self.assertEqual([spec for _, spec in environments], sub_suites)
+        created = [call.args[0] for call in environment_client.return_value.create.call_args_list]
+        self.assertEqual(
+            sorted(environment.metadata.name for environment in created),
+            sorted(f"environment-{index}" for index in range(20)),
+        )
+
+        self.logger.info("STEP: Verify that only a single environment client was created.")
+        environment_client.assert_called_once_with(None)
+
+        self.logger.info(
+            "STEP: Verify that the Environment resources are owned by the environment request."
+        )
+        for environment in created:
+            self.assertEqual(environment.metadata.namespace, "etos")
+            self.assertEqual(
+                environment.metadata.labels["etos.eiffel-community.github.io/suite-id"],
+                "test-suite-started-id",
+            )
+            self.assertEqual(
+                [reference.uid for reference in environment.metadata.ownerReferences],
+                ["testrun-uid", "environment-request-uid"],
+            )
+
+    def test_environment_owner_references(self):
+        """Test that the owner references of Environment resources are created once per request.
+
+        Approval criteria:
+            - The owner references shall be the same as if they were validated.
+            - The owner references shall only be created once per environment request.
+
+        Test steps::
+            1. Get the owner references for an environment request twice.
+            2. Verify that the owner references are the same as if they were validated.
+            3. Verify that the owner references were only created once.
+        """
+        self.logger.info("STEP: Get the owner references for an environment request twice.")
+        with patch.object(
+            OwnerReference, "model_construct", wraps=OwnerReference.model_construct
+        ) as model_construct:
+            # pylint:disable=protected-access
+            owner_references = self.environment_provider._environment_owner_references(self.request)
+            owner_references.append("not cached")
+            cached = self.environment_provider._environment_owner_references(self.request)
+
+        self.logger.info(
+            "STEP: Verify that the owner references are the same as if they were validated."
+        )
+        self.assertEqual(
+            cached,
+            [
+                *self.request.metadata.ownerReferences,
+                OwnerReference.model_validate(
+                    {
+                        "apiVersion": "etos.eiffel-community.github.io/v1alpha1",
+                        "kind": "EnvironmentRequest",
+                        "name": "environment-request",
+                        "uid": "environment-request-uid",
+                        "controller": False,
+                        "blockOwnerDeletion": True,
+                    }
+                ),
+            ],
+        )
+
+        self.logger.info("STEP: Verify that the owner references were only created once.")
+        model_construct.assert_called_once()
+        self.assertEqual(
+            list(self.environment_provider.owner_references), ["environment-request-uid"]
+        )
+
+    def test_provider_ruleset(self):
+        """Test that provider rulesets are the same as if the providers were validated.
+
+        Approval criteria:
+            - The ruleset of a JSONTas provider shall be the same as if it was validated.
+            - The ruleset of an external provider shall be the same as if it was validated.
+
+        Test steps::
+            1. Create the rulesets for a JSONTas provider and an external provider.
+            2. Verify that the rulesets are the same as if the providers were validated.
+        """
+        jsontas_provider = {
+            "apiVersion": "etos.eiffel-community.github.io/v1alpha1",
+            "kind": "Provider",
+            "metadata": {"name": "iut-provider", "namespace": "etos", "uid": "iut-provider-uid"},
+            "spec": {
+                "type": "iut",
+                "jsontas": {
+                    "iut": {
+                        "id": "iut-provider",
+                        "list": {
+                            "possible": {"$expand": {"value": {"type": "$identity.type"}}},
+                            "available": "$this.possible",
+                        },
+                        "prepare": {"stages": {"environment_provider": {"steps": {}}}},
+                    }
+                },
+            },
+        }
+        external_provider = {
+            "apiVersion": "etos.eiffel-community.github.io/v1alpha1",
+            "kind": "Provider",
+            "metadata": {"name": "log-area-provider", "namespace": "etos"},
+            "spec": {"type": "log-area", "host": "http://log-area-provider"},
+        }
+
+        self.logger.info(
+            "STEP: Create the rulesets for a JSONTas provider and an external provider."
+        )
+        # pylint:disable=protected-access
+        jsontas_ruleset = self.environment_provider._provider_ruleset(jsontas_provider, "iut")
+        external_ruleset = self.environment_provider._provider_ruleset(external_provider, "log")
+
+        self.logger.info(
+            "STEP: Verify that the rulesets are the same as if the providers were validated."
+        )
+        self.assertEqual(
+            json.loads(jsontas_ruleset),
+            {"iut": ProviderSchema.model_validate(jsontas_provider).to_jsontas()},
+        )
+        self.assertEqual(
+            json.loads(external_ruleset),
+            {"log": ProviderSchema.model_validate(external_provider).to_external()},
+        )